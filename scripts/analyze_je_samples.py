@@ -3,24 +3,41 @@ from pathlib import Path
 
 import pandas as pd
 
+try:
+    import python_calamine  # noqa: F401
+
+    EXCEL_ENGINE = "calamine"
+except ImportError:
+    EXCEL_ENGINE = "openpyxl"
+
 
 def detect_date_columns(frame: pd.DataFrame) -> tuple[list[str], pd.DataFrame]:
     date_columns: list[str] = []
-    updated = frame.copy()
-    for column in updated.columns:
-        series = updated[column]
-        if pd.api.types.is_datetime64_any_dtype(series):
+    to_replace: dict[str, pd.Series] = {}
+    for column in frame.columns:
+        series = frame[column]
+        kind = series.dtype.kind
+        if kind == "M":
             date_columns.append(column)
             continue
-        if pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series):
-            non_null_count = series.notna().sum()
-            if non_null_count == 0:
+        if kind in ("O", "U", "S"):
+            non_null = series.dropna()
+            non_null_count = len(non_null)
+            if non_null_count == 0 or series.nunique(dropna=True) <= 1:
+                continue
+            if isinstance(non_null.iat[0], (int, float)):
+                continue
+            sample = non_null.sample(min(500, non_null_count), random_state=0)
+            if sample.astype(str).str.contains(r"\d{2,4}", na=False).mean() < 0.5:
+                continue
+            if pd.to_datetime(sample, errors="coerce").notna().mean() < 0.8:
                 continue
             parsed = pd.to_datetime(series, errors="coerce")
             parsed_non_null = parsed.notna().sum()
             if parsed_non_null / non_null_count >= 0.8:
-                updated[column] = parsed
+                to_replace[column] = parsed
                 date_columns.append(column)
+    updated = frame.assign(**to_replace) if to_replace else frame
     return date_columns, updated
 
 
@@ -31,13 +48,16 @@ def build_summary(frame: pd.DataFrame, output_dir: Path) -> None:
     date_columns, updated = detect_date_columns(frame)
     numeric_columns = updated.select_dtypes(include="number").columns.tolist()
 
+    non_null_counts = updated.count().to_numpy()
+    unique_counts = updated.nunique(dropna=True).to_numpy()
+    dtypes = updated.dtypes.astype(str).to_numpy()
     column_summary = pd.DataFrame(
         {
             "column": updated.columns,
-            "non_null_count": updated.notna().sum().values,
-            "null_count": updated.isna().sum().values,
-            "unique_count": updated.nunique(dropna=True).values,
-            "dtype": updated.dtypes.astype(str).values,
+            "non_null_count": non_null_counts,
+            "null_count": row_count - non_null_counts,
+            "unique_count": unique_counts,
+            "dtype": dtypes,
         }
     )
     column_summary.to_csv(output_dir / "column_summary.csv", index=False)
@@ -53,12 +73,12 @@ def build_summary(frame: pd.DataFrame, output_dir: Path) -> None:
         numeric_summary = pd.DataFrame()
 
     if date_columns:
-        date_summary = pd.DataFrame(
-            {
-                "column": date_columns,
-                "min": [updated[col].min() for col in date_columns],
-                "max": [updated[col].max() for col in date_columns],
-            }
+        date_summary = (
+            updated[date_columns]
+            .agg(["min", "max"])
+            .transpose()
+            .reset_index()
+            .rename(columns={"index": "column"})
         )
         date_summary.to_csv(output_dir / "date_summary.csv", index=False)
         overall_min = date_summary["min"].min()
@@ -114,7 +134,7 @@ def main() -> None:
     output_dir = Path(args.output_dir)
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    frame = pd.read_excel(input_path)
+    frame = pd.read_excel(input_path, engine=EXCEL_ENGINE)
     build_summary(frame, output_dir)
 
 
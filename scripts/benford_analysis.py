@@ -1,17 +1,33 @@
 import argparse
-import csv
 import math
-import re
 import zipfile
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Iterable
 
-import xml.etree.ElementTree as ET
+import numpy as np
+import pandas as pd
+
+try:
+    from lxml import etree as ET
+
+    HAVE_LXML = True
+except ImportError:
+    import xml.etree.ElementTree as ET
+
+    HAVE_LXML = False
 
 
 EXPECTED_DIGITS = {digit: math.log10(1 + 1 / digit) for digit in range(1, 10)}
+EXPECTED_ARRAY = np.array([EXPECTED_DIGITS[digit] for digit in range(1, 10)])
 NAMESPACE = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_ROW_TAG = NAMESPACE + "row"
+_CELL_TAG = NAMESPACE + "c"
+_VALUE_TAG = NAMESPACE + "v"
+_INLINE_TAG = NAMESPACE + "is"
+_TEXT_TAG = NAMESPACE + "t"
+_SI_TAG = NAMESPACE + "si"
 
 
 @dataclass
@@ -20,16 +36,21 @@ class SheetData:
     rows: list[list[Any]]
 
 
-def column_index_from_ref(cell_ref: str) -> int:
-    letters = re.match(r"([A-Z]+)", cell_ref)
-    if not letters:
-        return 0
+@lru_cache(maxsize=16384)
+def _column_letters_to_index(letters: str) -> int:
     result = 0
-    for char in letters.group(1):
-        result = result * 26 + (ord(char) - ord("A") + 1)
+    for char in letters:
+        if "A" <= char <= "Z":
+            result = result * 26 + (ord(char) - 64)
+        else:
+            break
     return result
 
 
+def column_index_from_ref(cell_ref: str) -> int:
+    return _column_letters_to_index(cell_ref.rstrip("0123456789"))
+
+
 def read_shared_strings(zip_file: zipfile.ZipFile) -> list[str]:
     try:
         shared = zip_file.read("xl/sharedStrings.xml")
@@ -37,8 +58,8 @@ def read_shared_strings(zip_file: zipfile.ZipFile) -> list[str]:
         return []
     root = ET.fromstring(shared)
     strings: list[str] = []
-    for si in root.findall(f"{NAMESPACE}si"):
-        text_parts = [node.text or "" for node in si.findall(f".//{NAMESPACE}t")]
+    for si in root.findall(_SI_TAG):
+        text_parts = [node.text or "" for node in si.iter(_TEXT_TAG)]
         strings.append("".join(text_parts))
     return strings
 
@@ -46,11 +67,11 @@ def read_shared_strings(zip_file: zipfile.ZipFile) -> list[str]:
 def parse_cell_value(cell: ET.Element, shared_strings: list[str]) -> Any:
     cell_type = cell.attrib.get("t")
     if cell_type == "inlineStr":
-        inline = cell.find(f"{NAMESPACE}is")
-        text_node = inline.find(f".//{NAMESPACE}t") if inline is not None else None
+        inline = cell.find(_INLINE_TAG)
+        text_node = next(inline.iter(_TEXT_TAG), None) if inline is not None else None
         return text_node.text if text_node is not None else None
 
-    value_node = cell.find(f"{NAMESPACE}v")
+    value_node = cell.find(_VALUE_TAG)
     if value_node is None or value_node.text is None:
         return None
     raw = value_node.text
@@ -77,141 +98,134 @@ def load_first_sheet(path: Path) -> SheetData:
         if not sheet_names:
             raise ValueError("No worksheet found in the Excel file.")
         shared_strings = read_shared_strings(zip_file)
-        sheet_data = zip_file.read(sheet_names[0])
-    root = ET.fromstring(sheet_data)
-
-    rows: dict[int, dict[int, Any]] = {}
-    max_col = 0
-    for row in root.findall(f".//{NAMESPACE}row"):
-        row_idx = int(row.attrib.get("r", "0"))
-        row_cells: dict[int, Any] = {}
-        for cell in row.findall(f"{NAMESPACE}c"):
-            ref = cell.attrib.get("r", "")
-            col_idx = column_index_from_ref(ref)
-            if col_idx == 0:
-                continue
-            value = parse_cell_value(cell, shared_strings)
-            row_cells[col_idx] = value
-            max_col = max(max_col, col_idx)
-        if row_idx:
-            rows[row_idx] = row_cells
-
-    if 1 not in rows:
+
+        header_cells: dict[int, Any] | None = None
+        data_rows: list[list[Any]] = []
+        max_col = 0
+        with zip_file.open(sheet_names[0]) as sheet_stream:
+            if HAVE_LXML:
+                events = ET.iterparse(sheet_stream, events=("end",), tag=_ROW_TAG)
+            else:
+                events = ET.iterparse(sheet_stream, events=("end",))
+            for _, row in events:
+                if row.tag != _ROW_TAG:
+                    continue
+                row_idx = int(row.attrib.get("r", "0"))
+                row_cells: dict[int, Any] = {}
+                for cell in row:
+                    if cell.tag != _CELL_TAG:
+                        continue
+                    ref = cell.attrib.get("r", "")
+                    col_idx = column_index_from_ref(ref)
+                    if col_idx == 0:
+                        continue
+                    value = parse_cell_value(cell, shared_strings)
+                    row_cells[col_idx] = value
+                    max_col = max(max_col, col_idx)
+                if row_idx == 1:
+                    header_cells = row_cells
+                elif row_idx:
+                    width = max(row_cells) if row_cells else 0
+                    data_rows.append([row_cells.get(col_idx) for col_idx in range(1, width + 1)])
+                row.clear()
+                if HAVE_LXML:
+                    while row.getprevious() is not None:
+                        del row.getparent()[0]
+
+    if header_cells is None:
         raise ValueError("Unable to locate header row.")
     headers = [
-        str(rows[1].get(col_idx) or f"Column{col_idx}").strip()
+        str(header_cells.get(col_idx) or f"Column{col_idx}").strip()
         for col_idx in range(1, max_col + 1)
     ]
-    data_rows: list[list[Any]] = []
-    for row_idx in sorted(idx for idx in rows if idx != 1):
-        row_values = [rows[row_idx].get(col_idx) for col_idx in range(1, max_col + 1)]
-        data_rows.append(row_values)
+    for row_values in data_rows:
+        if len(row_values) < max_col:
+            row_values.extend([None] * (max_col - len(row_values)))
     return SheetData(headers=headers, rows=data_rows)
 
 
-def parse_numeric(value: Any) -> float | None:
-    if value is None or value == "":
-        return None
-    if isinstance(value, (int, float)):
-        return float(value)
-    try:
-        return float(str(value).replace(",", ""))
-    except ValueError:
-        return None
-
-
-def numeric_columns(sheet: SheetData) -> dict[str, list[float]]:
-    columns: dict[str, list[float]] = {header: [] for header in sheet.headers}
-    for row in sheet.rows:
-        for header, value in zip(sheet.headers, row):
-            numeric_value = parse_numeric(value)
-            if numeric_value is not None:
-                columns[header].append(numeric_value)
-    return {
-        header: values
-        for header, values in columns.items()
-        if values and not is_date_like_column(header, values)
-    }
+def numeric_columns(sheet: SheetData) -> dict[str, np.ndarray]:
+    columns: dict[str, np.ndarray] = {}
+    for header, column in zip(sheet.headers, zip(*sheet.rows)):
+        series = pd.Series(column, dtype=object)
+        numeric = pd.to_numeric(series, errors="coerce")
+        retry = numeric.isna() & series.notna()
+        if retry.any():
+            cleaned = series[retry].astype(str).str.replace(",", "", regex=False)
+            numeric.loc[retry] = pd.to_numeric(cleaned, errors="coerce")
+        values = numeric.to_numpy(dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if values.size and not is_date_like_column(header, values):
+            columns[header] = values
+    return columns
 
 
-def is_date_like_column(header: str, values: list[float]) -> bool:
+def is_date_like_column(header: str, values: np.ndarray) -> bool:
     if "date" in header.lower():
         return True
-    if not values:
+    array = np.asarray(values, dtype=np.float64)
+    if array.size == 0:
         return False
-    date_like = 0
-    for value in values:
-        if 20000 <= value <= 60000 and abs(value - round(value)) < 0.01:
-            date_like += 1
-    return date_like / len(values) >= 0.8
-
-
-def leading_digits(values: Iterable[float]) -> list[int]:
-    digits: list[int] = []
-    for value in values:
-        if value == 0:
-            continue
-        value = abs(value)
-        exponent = math.floor(math.log10(value))
-        leading = int(value / (10**exponent))
-        if 1 <= leading <= 9:
-            digits.append(leading)
-    return digits
-
-
-def benford_for_column(values: list[float], label: str) -> list[dict[str, Any]]:
+    mask = (array >= 20000) & (array <= 60000) & (np.abs(array - np.round(array)) < 0.01)
+    return np.count_nonzero(mask) / array.size >= 0.8
+
+
+def leading_digits(values: Iterable[float]) -> np.ndarray:
+    array = np.abs(np.asarray(values, dtype=np.float64))
+    array = array[array != 0]
+    if array.size == 0:
+        return np.zeros(0, dtype=np.int8)
+    # Dividing by the exact power of ten keeps round decimal amounts exact;
+    # extracting the mantissa via 10**(log10(a) % 1) misclassifies values
+    # like 2.0 when the log/exp round trip lands just below a digit boundary.
+    exponents = np.floor(np.log10(array))
+    digits = (array / 10.0**exponents).astype(np.int8)
+    return digits[(digits >= 1) & (digits <= 9)]
+
+
+def benford_counts(values: np.ndarray) -> np.ndarray:
     digits = leading_digits(values)
-    counts = {digit: digits.count(digit) for digit in range(1, 10)}
-    total = sum(counts.values())
-    rows: list[dict[str, Any]] = []
-    for digit in range(1, 10):
-        observed = counts[digit] / total if total else 0
-        expected = EXPECTED_DIGITS[digit]
-        rows.append(
-            {
-                "column": label,
-                "digit": digit,
-                "count": counts[digit],
-                "observed": observed,
-                "expected": expected,
-                "deviation": observed - expected,
-            }
-        )
-    return rows
-
-
-def summarize_benford(columns: dict[str, list[float]]) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
-    digit_detail: list[dict[str, Any]] = []
-    for label, values in columns.items():
-        digit_detail.extend(benford_for_column(values, label))
-
-    summary: list[dict[str, Any]] = []
-    for label in columns:
-        column_rows = [row for row in digit_detail if row["column"] == label]
-        deviations = [abs(row["deviation"]) for row in column_rows]
-        total_values = sum(row["count"] for row in column_rows)
-        max_dev_row = max(column_rows, key=lambda row: abs(row["deviation"]))
-        summary.append(
-            {
-                "column": label,
-                "total_values": total_values,
-                "mad": sum(deviations) / len(deviations) if deviations else 0,
-                "max_abs_deviation": max(deviations) if deviations else 0,
-                "top_deviation_digit": max_dev_row["digit"],
-            }
-        )
-    summary.sort(key=lambda row: row["mad"], reverse=True)
+    return np.bincount(digits, minlength=10)[1:]
+
+
+def summarize_benford(columns: dict[str, np.ndarray]) -> tuple[pd.DataFrame, pd.DataFrame]:
+    labels = list(columns)
+    if labels:
+        counts = np.vstack([benford_counts(values) for values in columns.values()])
+    else:
+        counts = np.zeros((0, 9), dtype=np.int64)
+    totals = counts.sum(axis=1)
+    observed = counts / np.where(totals == 0, 1, totals)[:, None]
+    deviation = observed - EXPECTED_ARRAY
+    abs_deviation = np.abs(deviation)
+
+    digit_detail = pd.DataFrame(
+        {
+            "column": np.repeat(labels, 9),
+            "digit": np.tile(np.arange(1, 10), len(labels)),
+            "count": counts.ravel(),
+            "observed": observed.ravel(),
+            "expected": np.tile(EXPECTED_ARRAY, len(labels)),
+            "deviation": deviation.ravel(),
+        }
+    )
+    summary = pd.DataFrame(
+        {
+            "column": labels,
+            "total_values": totals,
+            "mad": abs_deviation.mean(axis=1) if labels else totals,
+            "max_abs_deviation": abs_deviation.max(axis=1) if labels else totals,
+            "top_deviation_digit": abs_deviation.argmax(axis=1) + 1 if labels else totals,
+        }
+    ).sort_values("mad", ascending=False, kind="stable", ignore_index=True)
     return summary, digit_detail
 
 
-def write_csv(path: Path, rows: list[dict[str, Any]]) -> None:
-    if not rows:
+def write_csv(path: Path, table: pd.DataFrame) -> None:
+    if table.empty:
         path.write_text("", encoding="utf-8")
         return
-    with path.open("w", newline="", encoding="utf-8") as handle:
-        writer = csv.DictWriter(handle, fieldnames=list(rows[0].keys()))
-        writer.writeheader()
-        writer.writerows(rows)
+    table.to_csv(path, index=False)
 
 
 def svg_bar_chart(
@@ -245,19 +259,22 @@ def svg_bar_chart(
         )
 
     for series_idx, (name, values, color) in enumerate(series):
-        for idx, value in enumerate(values):
-            bar_height = (value / max_value) * chart_height if max_value else 0
-            x = (
-                margin
-                + idx * group_width
-                + (group_width - bar_width * series_count) / 2
-                + series_idx * bar_width
-            )
-            y = height - margin - bar_height
-            lines.append(
+        value_array = np.asarray(values, dtype=np.float64)
+        bar_heights = (value_array / max_value) * chart_height if max_value else np.zeros(value_array.size)
+        xs = (
+            margin
+            + np.arange(value_array.size) * group_width
+            + (group_width - bar_width * series_count) / 2
+            + series_idx * bar_width
+        )
+        ys = height - margin - bar_heights
+        lines.append(
+            "\n".join(
                 f'<rect x="{x:.2f}" y="{y:.2f}" width="{bar_width:.2f}" '
                 f'height="{bar_height:.2f}" fill="{color}"/>'
+                for x, y, bar_height in zip(xs, ys, bar_heights)
             )
+        )
 
     legend_x = width - margin + 10
     legend_y = margin
@@ -270,13 +287,13 @@ def svg_bar_chart(
     output_path.write_text("\n".join(lines), encoding="utf-8")
 
 
-def plot_overall(digit_detail: list[dict[str, Any]], output_dir: Path) -> None:
-    totals = {digit: 0 for digit in range(1, 10)}
-    for row in digit_detail:
-        totals[row["digit"]] += row["count"]
-    total_count = sum(totals.values())
-    observed = [(totals[digit] / total_count) if total_count else 0 for digit in range(1, 10)]
-    expected = [EXPECTED_DIGITS[digit] for digit in range(1, 10)]
+def plot_overall(digit_detail: pd.DataFrame, output_dir: Path) -> None:
+    totals = (
+        digit_detail.groupby("digit")["count"].sum().reindex(range(1, 10), fill_value=0)
+    )
+    total_count = int(totals.sum())
+    observed = (totals / total_count).tolist() if total_count else [0.0] * 9
+    expected = EXPECTED_ARRAY.tolist()
     labels = [str(digit) for digit in range(1, 10)]
     svg_bar_chart(
         output_dir / "benford_overall.svg",
@@ -286,9 +303,9 @@ def plot_overall(digit_detail: list[dict[str, Any]], output_dir: Path) -> None:
     )
 
 
-def plot_mad(summary: list[dict[str, Any]], output_dir: Path) -> None:
-    labels = [row["column"] for row in summary]
-    values = [row["mad"] for row in summary]
+def plot_mad(summary: pd.DataFrame, output_dir: Path) -> None:
+    labels = summary["column"].tolist()
+    values = summary["mad"].tolist()
     svg_bar_chart(
         output_dir / "benford_mad_by_column.svg",
         "Benford MAD by Column (Higher = More Deviation)",
@@ -313,9 +330,9 @@ def main() -> None:
     write_csv(output_dir / "benford_summary.csv", summary)
     write_csv(output_dir / "benford_digit_detail.csv", digit_detail)
 
-    if digit_detail:
+    if not digit_detail.empty:
         plot_overall(digit_detail, output_dir)
-    if summary:
+    if not summary.empty:
         plot_mad(summary, output_dir)
 
 